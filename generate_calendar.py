@@ -12,30 +12,55 @@ All events include a 1-hour reminder (VALARM).
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import hashlib
+import itertools
 import json
+import os
 import re
-import uuid
+import secrets
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Iterable, Optional
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional, TextIO
+from zoneinfo import ZoneInfo
 
 import requests
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+from urllib3.util.retry import Retry
 
 
 # -----------------------------
 # Helpers (ICS formatting)
 # -----------------------------
 
+# Built once per run; ZoneInfo construction reads the tzdata file
+_ET = ZoneInfo("America/New_York")
+_UTC = timezone.utc
+
+_ESCAPE_RE = re.compile(r'[\\\n,;]')
+_ESCAPES = {"\\": "\\\\", "\n": "\\n", ",": "\\,", ";": "\\;"}
+
+@functools.lru_cache(maxsize=1024)
 def ics_escape(s: str) -> str:
-    return (
-        s.replace("\\", "\\\\")
-         .replace("\n", "\\n")
-         .replace(",", "\\,")
-         .replace(";", "\\;")
-    )
+    # Most fields have nothing to escape; a C-level search bails out early
+    if not _ESCAPE_RE.search(s):
+        return s
+    # Single scan instead of one full copy per replaced character
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES[m.group()], s)
 
 def dtstamp_utc() -> str:
-    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return datetime.now(_UTC).strftime("%Y%m%dT%H%M%SZ")
+
+# RFC 5545 only needs UIDs to be unique, so a random per-run prefix plus a
+# counter is enough; no per-event RNG read or UUID object.
+_UID_PREFIX = secrets.token_hex(8)
+_uid_counter = itertools.count()
+
+def next_uid() -> str:
+    return f"{_UID_PREFIX}-{next(_uid_counter)}@sports-calendar"
 
 def fmt_date(d: date) -> str:
     return d.strftime("%Y%m%d")
@@ -44,44 +69,71 @@ def fmt_dt_local(d: datetime) -> str:
     # DTSTART;TZID=America/New_York:YYYYMMDDTHHMMSS
     return d.strftime("%Y%m%dT%H%M%S")
 
-def vevent_all_day(
+def wline(fp: TextIO, line: str) -> None:
+    """
+    Write one content line, folded per RFC 5545 so no physical line exceeds
+    75 octets (continuations start with a single space). Folds only on UTF-8
+    character boundaries.
+    """
+    if len(line) <= 75 and line.isascii():
+        fp.write(line)
+        fp.write("\r\n")
+        return
+    b = line.encode("utf-8")
+    i, limit = 0, 75
+    while len(b) - i > limit:
+        cut = i + limit
+        while b[cut] & 0xC0 == 0x80:  # don't split a multi-byte character
+            cut -= 1
+        fp.write(b[i:cut].decode("utf-8"))
+        fp.write("\r\n ")
+        i, limit = cut, 74
+    fp.write(b[i:].decode("utf-8"))
+    fp.write("\r\n")
+
+def emit_vevent_all_day(
+    fp: TextIO,
+    dtstamp: str,
     summary: str,
     start_inclusive: date,
     end_inclusive: date,
     location: str = "",
     description: str = "",
     categories: str = "",
-) -> str:
-    uid = f"{uuid.uuid4()}@sports-calendar"
+) -> None:
+    uid = next_uid()
     dtend_exclusive = end_inclusive + timedelta(days=1)
 
-    lines = [
-        "BEGIN:VEVENT",
-        f"UID:{uid}",
-        f"DTSTAMP:{dtstamp_utc()}",
-        f"SUMMARY:{ics_escape(summary)}",
-        f"DTSTART;VALUE=DATE:{fmt_date(start_inclusive)}",
-        f"DTEND;VALUE=DATE:{fmt_date(dtend_exclusive)}",
-    ]
+    fp.write(
+        "BEGIN:VEVENT\r\n"
+        f"UID:{uid}\r\n"
+        f"DTSTAMP:{dtstamp}\r\n"
+    )
+    wline(fp, f"SUMMARY:{ics_escape(summary)}")
+    fp.write(
+        f"DTSTART;VALUE=DATE:{fmt_date(start_inclusive)}\r\n"
+        f"DTEND;VALUE=DATE:{fmt_date(dtend_exclusive)}\r\n"
+    )
     if location:
-        lines.append(f"LOCATION:{ics_escape(location)}")
+        wline(fp, f"LOCATION:{ics_escape(location)}")
     if categories:
-        lines.append(f"CATEGORIES:{ics_escape(categories)}")
+        wline(fp, f"CATEGORIES:{ics_escape(categories)}")
     if description:
-        lines.append(f"DESCRIPTION:{ics_escape(description)}")
+        wline(fp, f"DESCRIPTION:{ics_escape(description)}")
 
     # 1-hour reminder
-    lines += [
-        "BEGIN:VALARM",
-        "ACTION:DISPLAY",
-        "DESCRIPTION:Reminder",
-        "TRIGGER:-PT1H",
-        "END:VALARM",
-        "END:VEVENT",
-    ]
-    return "\n".join(lines)
-
-def vevent_timed(
+    fp.write(
+        "BEGIN:VALARM\r\n"
+        "ACTION:DISPLAY\r\n"
+        "DESCRIPTION:Reminder\r\n"
+        "TRIGGER:-PT1H\r\n"
+        "END:VALARM\r\n"
+        "END:VEVENT\r\n"
+    )
+
+def emit_vevent_timed(
+    fp: TextIO,
+    dtstamp: str,
     summary: str,
     start_local: datetime,
     duration_hours: int = 5,
@@ -89,182 +141,261 @@ def vevent_timed(
     location: str = "",
     description: str = "",
     categories: str = "",
-) -> str:
-    uid = f"{uuid.uuid4()}@sports-calendar"
+) -> None:
+    uid = next_uid()
     end_local = start_local + timedelta(hours=duration_hours)
 
-    lines = [
-        "BEGIN:VEVENT",
-        f"UID:{uid}",
-        f"DTSTAMP:{dtstamp_utc()}",
-        f"SUMMARY:{ics_escape(summary)}",
-        f"DTSTART;TZID={tzid}:{fmt_dt_local(start_local)}",
-        f"DTEND;TZID={tzid}:{fmt_dt_local(end_local)}",
-    ]
+    fp.write(
+        "BEGIN:VEVENT\r\n"
+        f"UID:{uid}\r\n"
+        f"DTSTAMP:{dtstamp}\r\n"
+    )
+    wline(fp, f"SUMMARY:{ics_escape(summary)}")
+    fp.write(
+        f"DTSTART;TZID={tzid}:{fmt_dt_local(start_local)}\r\n"
+        f"DTEND;TZID={tzid}:{fmt_dt_local(end_local)}\r\n"
+    )
     if location:
-        lines.append(f"LOCATION:{ics_escape(location)}")
+        wline(fp, f"LOCATION:{ics_escape(location)}")
     if categories:
-        lines.append(f"CATEGORIES:{ics_escape(categories)}")
+        wline(fp, f"CATEGORIES:{ics_escape(categories)}")
     if description:
-        lines.append(f"DESCRIPTION:{ics_escape(description)}")
+        wline(fp, f"DESCRIPTION:{ics_escape(description)}")
 
     # 1-hour reminder
-    lines += [
-        "BEGIN:VALARM",
-        "ACTION:DISPLAY",
-        "DESCRIPTION:Reminder",
-        "TRIGGER:-PT1H",
-        "END:VALARM",
-        "END:VEVENT",
-    ]
-    return "\n".join(lines)
+    fp.write(
+        "BEGIN:VALARM\r\n"
+        "ACTION:DISPLAY\r\n"
+        "DESCRIPTION:Reminder\r\n"
+        "TRIGGER:-PT1H\r\n"
+        "END:VALARM\r\n"
+        "END:VEVENT\r\n"
+    )
 
 
 # -----------------------------
 # Static calendars (2026)
 # -----------------------------
 
-def add_static_f1_2026(events: list[str]) -> None:
-    # Official F1 2026 calendar (weekend date ranges) :contentReference[oaicite:2]{index=2}
-    f1 = [
-        ("Australian Grand Prix", "2026-03-06", "2026-03-08", "Melbourne, Australia"),
-        ("Chinese Grand Prix", "2026-03-13", "2026-03-15", "Shanghai, China"),
-        ("Japanese Grand Prix", "2026-03-27", "2026-03-29", "Suzuka, Japan"),
-        ("Bahrain Grand Prix", "2026-04-10", "2026-04-12", "Sakhir, Bahrain"),
-        ("Saudi Arabian Grand Prix", "2026-04-17", "2026-04-19", "Jeddah, Saudi Arabia"),
-        ("Miami Grand Prix", "2026-05-01", "2026-05-03", "Miami, USA"),
-        ("Canadian Grand Prix", "2026-05-22", "2026-05-24", "Montreal, Canada"),
-        ("Monaco Grand Prix", "2026-06-05", "2026-06-07", "Monaco"),
-        ("Barcelona-Catalunya Grand Prix", "2026-06-12", "2026-06-14", "Barcelona, Spain"),
-        ("Austrian Grand Prix", "2026-06-26", "2026-06-28", "Spielberg, Austria"),
-        ("British Grand Prix", "2026-07-03", "2026-07-05", "Silverstone, Great Britain"),
-        ("Belgian Grand Prix", "2026-07-17", "2026-07-19", "Spa-Francorchamps, Belgium"),
-        ("Hungarian Grand Prix", "2026-07-24", "2026-07-26", "Budapest, Hungary"),
-        ("Dutch Grand Prix", "2026-08-21", "2026-08-23", "Zandvoort, Netherlands"),
-        ("Italian Grand Prix", "2026-09-04", "2026-09-06", "Monza, Italy"),
-        ("Spanish Grand Prix (Madrid)", "2026-09-11", "2026-09-13", "Madrid, Spain"),
-        ("Azerbaijan Grand Prix", "2026-09-24", "2026-09-26", "Baku, Azerbaijan"),
-        ("Singapore Grand Prix", "2026-10-09", "2026-10-11", "Singapore"),
-        ("United States Grand Prix", "2026-10-23", "2026-10-25", "Austin, USA"),
-        ("Mexico City Grand Prix", "2026-10-30", "2026-11-01", "Mexico City, Mexico"),
-        ("São Paulo Grand Prix", "2026-11-06", "2026-11-08", "São Paulo, Brazil"),
-        ("Las Vegas Grand Prix", "2026-11-19", "2026-11-21", "Las Vegas, USA"),
-        ("Qatar Grand Prix", "2026-11-27", "2026-11-29", "Lusail, Qatar"),
-        ("Abu Dhabi Grand Prix", "2026-12-04", "2026-12-06", "Abu Dhabi, UAE"),
-    ]
-    for name, s, e, loc in f1:
-        sd = date.fromisoformat(s)
-        ed = date.fromisoformat(e)
-        events.append(
-            vevent_all_day(
-                summary=f"🟦 F1 – {name}",
-                start_inclusive=sd,
-                end_inclusive=ed,
-                location=loc,
-                description="Race weekend dates (session times not included).",
-                categories="Formula 1",
-            )
+# Official F1 2026 calendar (weekend date ranges) :contentReference[oaicite:2]{index=2}
+F1_2026 = [
+    ("Australian Grand Prix", date(2026, 3, 6), date(2026, 3, 8), "Melbourne, Australia"),
+    ("Chinese Grand Prix", date(2026, 3, 13), date(2026, 3, 15), "Shanghai, China"),
+    ("Japanese Grand Prix", date(2026, 3, 27), date(2026, 3, 29), "Suzuka, Japan"),
+    ("Bahrain Grand Prix", date(2026, 4, 10), date(2026, 4, 12), "Sakhir, Bahrain"),
+    ("Saudi Arabian Grand Prix", date(2026, 4, 17), date(2026, 4, 19), "Jeddah, Saudi Arabia"),
+    ("Miami Grand Prix", date(2026, 5, 1), date(2026, 5, 3), "Miami, USA"),
+    ("Canadian Grand Prix", date(2026, 5, 22), date(2026, 5, 24), "Montreal, Canada"),
+    ("Monaco Grand Prix", date(2026, 6, 5), date(2026, 6, 7), "Monaco"),
+    ("Barcelona-Catalunya Grand Prix", date(2026, 6, 12), date(2026, 6, 14), "Barcelona, Spain"),
+    ("Austrian Grand Prix", date(2026, 6, 26), date(2026, 6, 28), "Spielberg, Austria"),
+    ("British Grand Prix", date(2026, 7, 3), date(2026, 7, 5), "Silverstone, Great Britain"),
+    ("Belgian Grand Prix", date(2026, 7, 17), date(2026, 7, 19), "Spa-Francorchamps, Belgium"),
+    ("Hungarian Grand Prix", date(2026, 7, 24), date(2026, 7, 26), "Budapest, Hungary"),
+    ("Dutch Grand Prix", date(2026, 8, 21), date(2026, 8, 23), "Zandvoort, Netherlands"),
+    ("Italian Grand Prix", date(2026, 9, 4), date(2026, 9, 6), "Monza, Italy"),
+    ("Spanish Grand Prix (Madrid)", date(2026, 9, 11), date(2026, 9, 13), "Madrid, Spain"),
+    ("Azerbaijan Grand Prix", date(2026, 9, 24), date(2026, 9, 26), "Baku, Azerbaijan"),
+    ("Singapore Grand Prix", date(2026, 10, 9), date(2026, 10, 11), "Singapore"),
+    ("United States Grand Prix", date(2026, 10, 23), date(2026, 10, 25), "Austin, USA"),
+    ("Mexico City Grand Prix", date(2026, 10, 30), date(2026, 11, 1), "Mexico City, Mexico"),
+    ("São Paulo Grand Prix", date(2026, 11, 6), date(2026, 11, 8), "São Paulo, Brazil"),
+    ("Las Vegas Grand Prix", date(2026, 11, 19), date(2026, 11, 21), "Las Vegas, USA"),
+    ("Qatar Grand Prix", date(2026, 11, 27), date(2026, 11, 29), "Lusail, Qatar"),
+    ("Abu Dhabi Grand Prix", date(2026, 12, 4), date(2026, 12, 6), "Abu Dhabi, UAE"),
+]
+
+def add_static_f1_2026(fp: TextIO, dtstamp: str) -> None:
+    for name, sd, ed, loc in F1_2026:
+        emit_vevent_all_day(
+            fp,
+            dtstamp,
+            summary=f"🟦 F1 – {name}",
+            start_inclusive=sd,
+            end_inclusive=ed,
+            location=loc,
+            description="Race weekend dates (session times not included).",
+            categories="Formula 1",
         )
 
-def add_static_wrc_2026(events: list[str]) -> None:
-    # WRC calendar 2026 date ranges :contentReference[oaicite:3]{index=3}
-    wrc = [
-        ("Rallye Monte-Carlo", "2026-01-22", "2026-01-25", "Monaco"),
-        ("Rally Sweden", "2026-02-12", "2026-02-15", "Sweden"),
-        ("Safari Rally Kenya", "2026-03-12", "2026-03-15", "Kenya"),
-        ("Croatia Rally", "2026-04-09", "2026-04-12", "Croatia"),
-        ("Rally Islas Canarias", "2026-04-23", "2026-04-26", "Spain"),
-        ("Vodafone Rally de Portugal", "2026-05-07", "2026-05-10", "Portugal"),
-        ("FORUM8 Rally Japan", "2026-05-28", "2026-05-31", "Japan"),
-        ("EKO Acropolis Rally Greece", "2026-06-25", "2026-06-28", "Greece"),
-        ("Delfi Rally Estonia", "2026-07-16", "2026-07-19", "Estonia"),
-        ("Secto Rally Finland", "2026-07-30", "2026-08-02", "Finland"),
-        ("ueno Rally del Paraguay", "2026-08-27", "2026-08-30", "Paraguay"),
-        ("Rally Chile Bio Bío", "2026-09-10", "2026-09-13", "Chile"),
-        ("Rally Italia Sardegna", "2026-10-01", "2026-10-04", "Italy"),
-        ("Rally Saudi Arabia", "2026-11-11", "2026-11-14", "Saudi Arabia"),
-    ]
-    for name, s, e, loc in wrc:
-        sd = date.fromisoformat(s)
-        ed = date.fromisoformat(e)
-        events.append(
-            vevent_all_day(
-                summary=f"🟩 WRC – {name}",
-                start_inclusive=sd,
-                end_inclusive=ed,
-                location=loc,
-                description="Rally date range (stage times not included).",
-                categories="WRC",
-            )
+# WRC calendar 2026 date ranges :contentReference[oaicite:3]{index=3}
+WRC_2026 = [
+    ("Rallye Monte-Carlo", date(2026, 1, 22), date(2026, 1, 25), "Monaco"),
+    ("Rally Sweden", date(2026, 2, 12), date(2026, 2, 15), "Sweden"),
+    ("Safari Rally Kenya", date(2026, 3, 12), date(2026, 3, 15), "Kenya"),
+    ("Croatia Rally", date(2026, 4, 9), date(2026, 4, 12), "Croatia"),
+    ("Rally Islas Canarias", date(2026, 4, 23), date(2026, 4, 26), "Spain"),
+    ("Vodafone Rally de Portugal", date(2026, 5, 7), date(2026, 5, 10), "Portugal"),
+    ("FORUM8 Rally Japan", date(2026, 5, 28), date(2026, 5, 31), "Japan"),
+    ("EKO Acropolis Rally Greece", date(2026, 6, 25), date(2026, 6, 28), "Greece"),
+    ("Delfi Rally Estonia", date(2026, 7, 16), date(2026, 7, 19), "Estonia"),
+    ("Secto Rally Finland", date(2026, 7, 30), date(2026, 8, 2), "Finland"),
+    ("ueno Rally del Paraguay", date(2026, 8, 27), date(2026, 8, 30), "Paraguay"),
+    ("Rally Chile Bio Bío", date(2026, 9, 10), date(2026, 9, 13), "Chile"),
+    ("Rally Italia Sardegna", date(2026, 10, 1), date(2026, 10, 4), "Italy"),
+    ("Rally Saudi Arabia", date(2026, 11, 11), date(2026, 11, 14), "Saudi Arabia"),
+]
+
+def add_static_wrc_2026(fp: TextIO, dtstamp: str) -> None:
+    for name, sd, ed, loc in WRC_2026:
+        emit_vevent_all_day(
+            fp,
+            dtstamp,
+            summary=f"🟩 WRC – {name}",
+            start_inclusive=sd,
+            end_inclusive=ed,
+            location=loc,
+            description="Rally date range (stage times not included).",
+            categories="WRC",
         )
 
-def add_static_gtwc_europe_2026(events: list[str]) -> None:
-    # GT World Challenge Europe 2026 calendar (round date ranges) :contentReference[oaicite:4]{index=4}
-    gt = [
-        ("Circuit Paul Ricard (Round 1)", "2026-04-10", "2026-04-12", "Le Castellet, France"),
-        ("Brands Hatch (Round 2)", "2026-05-02", "2026-05-03", "Kent, Great Britain"),
-        ("Monza (Round 3)", "2026-05-30", "2026-05-31", "Monza, Italy"),
-        ("CrowdStrike 24 Hours of Spa (Round 4)", "2026-06-25", "2026-06-28", "Spa-Francorchamps, Belgium"),
-        ("Misano (Round 5)", "2026-07-18", "2026-07-19", "Misano, Italy"),
-        ("Magny-Cours (Round 6)", "2026-08-01", "2026-08-02", "Magny-Cours, France"),
-        ("Nürburgring (Round 7)", "2026-08-29", "2026-08-30", "Nürburg, Germany"),
-        ("Zandvoort (Round 8)", "2026-09-19", "2026-09-20", "Zandvoort, Netherlands"),
-        ("Barcelona (Round 9)", "2026-10-03", "2026-10-04", "Barcelona, Spain"),
-        ("Portimão (Round 10)", "2026-10-17", "2026-10-18", "Portimão, Portugal"),
-    ]
-    for name, s, e, loc in gt:
-        sd = date.fromisoformat(s)
-        ed = date.fromisoformat(e)
-        events.append(
-            vevent_all_day(
-                summary=f"🟥 GTWC Europe – {name}",
-                start_inclusive=sd,
-                end_inclusive=ed,
-                location=loc,
-                description="Race weekend dates (session times not included).",
-                categories="GT World Challenge Europe",
-            )
+# GT World Challenge Europe 2026 calendar (round date ranges) :contentReference[oaicite:4]{index=4}
+GTWC_EUROPE_2026 = [
+    ("Circuit Paul Ricard (Round 1)", date(2026, 4, 10), date(2026, 4, 12), "Le Castellet, France"),
+    ("Brands Hatch (Round 2)", date(2026, 5, 2), date(2026, 5, 3), "Kent, Great Britain"),
+    ("Monza (Round 3)", date(2026, 5, 30), date(2026, 5, 31), "Monza, Italy"),
+    ("CrowdStrike 24 Hours of Spa (Round 4)", date(2026, 6, 25), date(2026, 6, 28), "Spa-Francorchamps, Belgium"),
+    ("Misano (Round 5)", date(2026, 7, 18), date(2026, 7, 19), "Misano, Italy"),
+    ("Magny-Cours (Round 6)", date(2026, 8, 1), date(2026, 8, 2), "Magny-Cours, France"),
+    ("Nürburgring (Round 7)", date(2026, 8, 29), date(2026, 8, 30), "Nürburg, Germany"),
+    ("Zandvoort (Round 8)", date(2026, 9, 19), date(2026, 9, 20), "Zandvoort, Netherlands"),
+    ("Barcelona (Round 9)", date(2026, 10, 3), date(2026, 10, 4), "Barcelona, Spain"),
+    ("Portimão (Round 10)", date(2026, 10, 17), date(2026, 10, 18), "Portimão, Portugal"),
+]
+
+def add_static_gtwc_europe_2026(fp: TextIO, dtstamp: str) -> None:
+    for name, sd, ed, loc in GTWC_EUROPE_2026:
+        emit_vevent_all_day(
+            fp,
+            dtstamp,
+            summary=f"🟥 GTWC Europe – {name}",
+            start_inclusive=sd,
+            end_inclusive=ed,
+            location=loc,
+            description="Race weekend dates (session times not included).",
+            categories="GT World Challenge Europe",
         )
 
 
+# -----------------------------
+# HTTP cache (scraped sources)
+# -----------------------------
+
+CACHE_DIR = Path(".cache")
+ESPN_HASH_PATH = CACHE_DIR / "last_espn.hash"
+
+# One pooled session for every scraped source: connections (and TLS) are
+# reused across fetches, and transient gateway errors are retried.
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "Mozilla/5.0"
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+))
+
+def _load_cached(url: str, stem: str) -> str:
+    """
+    GET `url`, revalidating against the copy kept in .cache/<stem>.html.
+    Sends If-None-Match / If-Modified-Since so an unchanged page comes back
+    as a bodiless 304 and is served from disk instead.
+    """
+    body_path = CACHE_DIR / f"{stem}.html"
+    meta_path = CACHE_DIR / f"{stem}.meta.json"
+
+    meta: dict[str, Any] = {}
+    if body_path.exists() and meta_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except ValueError:
+            meta = {}
+        # Cache is keyed by URL; a different source under the same stem is a miss
+        if meta.get("url") != url:
+            meta = {}
+
+    headers: dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    resp = _SESSION.get(url, timeout=30, headers=headers)
+    if resp.status_code == 304 and meta:
+        return body_path.read_text(encoding="utf-8")
+
+    # Error pages must not be parsed as an empty schedule; let callers fall back
+    resp.raise_for_status()
+    if resp.status_code == 304:
+        raise requests.HTTPError(f"304 from {url} with no cached body", response=resp)
+
+    if resp.status_code == 200:
+        CACHE_DIR.mkdir(exist_ok=True)
+        body_path.write_text(resp.text, encoding="utf-8")
+        meta_path.write_text(json.dumps({
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+        }), encoding="utf-8")
+    return resp.text
+
+
 # -----------------------------
 # UFC auto-updating (ESPN)
 # -----------------------------
 
-from zoneinfo import ZoneInfo
+_MONTHS = {m: i for i, m in enumerate(
+    ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"], start=1
+)}
 
-def fetch_ufc_events_from_espn_table(max_events: int = 200):
+# Example row cells on page:
+# "Sat, Jan 24" | "5:00 PM" | "UFC 324: ..." | ... | "T-Mobile Arena, Las Vegas, NV"
+# Cells are matched by content rather than position; this is intentionally forgiving.
+_DATE_RE = re.compile(r'([A-Z][a-z]{2})\s+(\d{1,2})\b')
+_TIME_RE = re.compile(r'(\d{1,2}:\d{2}\s*[AP]M)')
+
+def _parse_schedule_rows(html: str) -> Iterable[tuple[str, str, str, str, str]]:
+    """
+    Yield (month, day, time, event name, location) for each schedule table row.
+    """
+    tree = LexborHTMLParser(html)
+    for row in tree.css("table.Table tbody tr"):
+        cells = [td.text(separator=" ", strip=True) for td in row.css("td")]
+        name_idx = next((i for i, c in enumerate(cells) if c.startswith("UFC")), None)
+        if name_idx is None:
+            continue
+
+        date_m = time_m = None
+        for c in cells[:name_idx + 1]:
+            date_m = date_m or _DATE_RE.search(c)
+            time_m = time_m or _TIME_RE.search(c)
+        if not date_m or not time_m:
+            continue
+
+        # Location is the first populated cell after the event name; later
+        # columns (tickets etc.) must not be picked up
+        location = next((c for c in cells[name_idx + 1:] if c), "")
+        yield date_m.group(1), date_m.group(2), time_m.group(1), cells[name_idx], location
+
+ESPN_UFC_URL = "https://www.espn.com/mma/schedule/_/league/ufc"
+
+def fetch_ufc_events_from_espn_table(max_events: int = 200, html: Optional[str] = None):
     """
     Scrape the visible UFC schedule table from ESPN.
     ESPN shows times in ET on the page. :contentReference[oaicite:2]{index=2}
+    Pass `html` to parse an already-fetched page instead of downloading it.
     """
-    url = "https://www.espn.com/mma/schedule/_/league/ufc"
-    html = requests.get(url, timeout=30, headers={"User-Agent": "Mozilla/5.0"}).text
-
-    # Example row text patterns on page:
-    # "Jan 24 5:00 PM" then "UFC 324: ..." then "T-Mobile Arena, Las Vegas, NV"
-    # We'll capture blocks containing Month Day, Time, Event, Location.
-    # This regex is intentionally forgiving.
-    row_re = re.compile(
-        r'([A-Z][a-z]{2})\s+(\d{1,2})\s*.*?(\d{1,2}:\d{2}\s*[AP]M).*?'
-        r'(UFC[^<\n\r]+).*?'
-        r'([A-Za-z0-9].{5,120}?)\s*(?:</td>|</tr>)',
-        re.S
-    )
+    if html is None:
+        html = _load_cached(ESPN_UFC_URL, "espn_ufc")
 
-    month_map = {m: i for i, m in enumerate(
-        ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"], start=1
-    )}
-
-    et = ZoneInfo("America/New_York")
-    now_et = datetime.now(et)
+    now_et = datetime.now(_ET)
 
+    seen: set[tuple[str, datetime]] = set()
     out = []
-    for mo, day, time_str, event_name, location in row_re.findall(html):
+    for mo, day, time_str, event_name, location in _parse_schedule_rows(html):
         try:
             year = now_et.year  # page is "2026 season" right now, but keep flexible
             # If we're late in year and see Jan/Feb, it might be next year:
-            mnum = month_map.get(mo)
+            mnum = _MONTHS.get(mo)
             if not mnum:
                 continue
 
@@ -273,70 +404,74 @@ def fetch_ufc_events_from_espn_table(max_events: int = 200):
                 year += 1
 
             dt_et = datetime.strptime(f"{year}-{mnum:02d}-{int(day):02d} {time_str.strip()}",
-                                      "%Y-%m-%d %I:%M %p").replace(tzinfo=et)
+                                      "%Y-%m-%d %I:%M %p").replace(tzinfo=_ET)
 
             # Only keep upcoming (or very recent) events
             if dt_et < (now_et - timedelta(days=7)):
                 continue
 
-            out.append((event_name.strip(), dt_et, location.strip()))
+            # Deduplicate as we go so max_events counts unique events
+            key = (event_name.strip(), dt_et)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            out.append((key[0], dt_et, location.strip()))
             if len(out) >= max_events:
                 break
         except Exception:
             continue
 
-    # Deduplicate
-    uniq = {}
-    for name, dt_et, loc in out:
-        uniq[(name, dt_et)] = (name, dt_et, loc)
-
-    return [uniq[k] for k in sorted(uniq.keys(), key=lambda x: x[1])]
+    out.sort(key=lambda x: x[1])
+    return out
 
-def vevent_timed_utc(summary: str, start_et: datetime, duration_hours: int = 5,
-                    location: str = "", description: str = "", categories: str = "") -> str:
-    uid = f"{uuid.uuid4()}@sports-calendar"
-    start_utc = start_et.astimezone(timezone.utc)
-    end_utc = (start_et + timedelta(hours=duration_hours)).astimezone(timezone.utc)
+def emit_vevent_timed_utc(fp: TextIO, dtstamp: str, summary: str, start_et: datetime,
+                          duration_hours: int = 5, location: str = "", description: str = "",
+                          categories: str = "") -> None:
+    uid = next_uid()
+    start_utc = start_et.astimezone(_UTC)
+    end_utc = (start_et + timedelta(hours=duration_hours)).astimezone(_UTC)
 
     def fmtz(d: datetime) -> str:
         return d.strftime("%Y%m%dT%H%M%SZ")
 
-    lines = [
-        "BEGIN:VEVENT",
-        f"UID:{uid}",
-        f"DTSTAMP:{dtstamp_utc()}",
-        f"SUMMARY:{ics_escape(summary)}",
-        f"DTSTART:{fmtz(start_utc)}",
-        f"DTEND:{fmtz(end_utc)}",
-    ]
+    fp.write(
+        "BEGIN:VEVENT\r\n"
+        f"UID:{uid}\r\n"
+        f"DTSTAMP:{dtstamp}\r\n"
+    )
+    wline(fp, f"SUMMARY:{ics_escape(summary)}")
+    fp.write(
+        f"DTSTART:{fmtz(start_utc)}\r\n"
+        f"DTEND:{fmtz(end_utc)}\r\n"
+    )
     if location:
-        lines.append(f"LOCATION:{ics_escape(location)}")
+        wline(fp, f"LOCATION:{ics_escape(location)}")
     if categories:
-        lines.append(f"CATEGORIES:{ics_escape(categories)}")
+        wline(fp, f"CATEGORIES:{ics_escape(categories)}")
     if description:
-        lines.append(f"DESCRIPTION:{ics_escape(description)}")
-
-    lines += [
-        "BEGIN:VALARM",
-        "ACTION:DISPLAY",
-        "DESCRIPTION:Reminder",
-        "TRIGGER:-PT1H",
-        "END:VALARM",
-        "END:VEVENT",
-    ]
-    return "\n".join(lines)
-
-def add_dynamic_ufc(events: list[str]) -> None:
-    for name, start_et, loc in fetch_ufc_events_from_espn_table():
-        events.append(
-            vevent_timed_utc(
-                summary=f"🟪 {name}",
-                start_et=start_et,
-                duration_hours=5,
-                location=loc,
-                description="Auto-updated from ESPN UFC schedule (times shown as ET on ESPN).",
-                categories="UFC",
-            )
+        wline(fp, f"DESCRIPTION:{ics_escape(description)}")
+
+    fp.write(
+        "BEGIN:VALARM\r\n"
+        "ACTION:DISPLAY\r\n"
+        "DESCRIPTION:Reminder\r\n"
+        "TRIGGER:-PT1H\r\n"
+        "END:VALARM\r\n"
+        "END:VEVENT\r\n"
+    )
+
+def add_dynamic_ufc(fp: TextIO, dtstamp: str, html: Optional[str] = None) -> None:
+    for name, start_et, loc in fetch_ufc_events_from_espn_table(html=html):
+        emit_vevent_timed_utc(
+            fp,
+            dtstamp,
+            summary=f"🟪 {name}",
+            start_et=start_et,
+            duration_hours=5,
+            location=loc,
+            description="Auto-updated from ESPN UFC schedule (times shown as ET on ESPN).",
+            categories="UFC",
         )
 
 
@@ -345,47 +480,124 @@ def add_dynamic_ufc(events: list[str]) -> None:
 # Build calendar
 # -----------------------------
 
-def build_calendar() -> str:
-    events: list[str] = []
+def add_ufc_with_fallback(fp: TextIO, dtstamp: str, html: Optional[str] = None,
+                          fetch_error: Optional[Exception] = None) -> bool:
+    """
+    Add UFC events, or a placeholder event if ESPN can't be fetched/parsed.
+    A `fetch_error` from an earlier fetch goes straight to the placeholder
+    without downloading again. Returns False when the placeholder was used.
+    """
+    if fetch_error is None:
+        try:
+            add_dynamic_ufc(fp, dtstamp, html)
+            return True
+        except Exception as e:
+            fetch_error = e
+
+    # Don't fail the whole calendar if ESPN changes something
+    emit_vevent_all_day(
+        fp,
+        dtstamp,
+        summary="🟪 UFC – (Auto-update temporarily unavailable)",
+        start_inclusive=date.today(),
+        end_inclusive=date.today(),
+        description=f"UFC fetch failed: {fetch_error}",
+        categories="UFC",
+    )
+    return False
+
+def build_calendar(fp: TextIO, espn_html: Optional[str] = None,
+                   espn_error: Optional[Exception] = None) -> bool:
+    """
+    Write the full calendar to `fp`. Returns False if the UFC section fell
+    back to the "auto-update unavailable" placeholder.
+    """
+    # RFC 5545 content lines are CRLF-terminated
+    fp.write(
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//Custom Sports Master Feed//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        "METHOD:PUBLISH\r\n"
+        "X-WR-CALNAME:WRC + GTWC Europe + F1 + UFC (Master Feed)\r\n"
+        "X-WR-TIMEZONE:America/New_York\r\n"
+    )
+
+    # One DTSTAMP shared by every VEVENT in this build
+    dtstamp = dtstamp_utc()
 
-    add_static_f1_2026(events)
-    add_static_wrc_2026(events)
-    add_static_gtwc_europe_2026(events)
+    add_static_f1_2026(fp, dtstamp)
+    add_static_wrc_2026(fp, dtstamp)
+    add_static_gtwc_europe_2026(fp, dtstamp)
 
     # UFC auto-updates
-    try:
-        add_dynamic_ufc(events)
-    except Exception as e:
-        # Don't fail the whole calendar if ESPN changes something
-        events.append(
-            vevent_all_day(
-                summary="🟪 UFC – (Auto-update temporarily unavailable)",
-                start_inclusive=date.today(),
-                end_inclusive=date.today(),
-                description=f"UFC fetch failed: {e}",
-                categories="UFC",
-            )
-        )
+    ufc_ok = add_ufc_with_fallback(fp, dtstamp, espn_html, espn_error)
 
-    cal_lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//Custom Sports Master Feed//EN",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-        "X-WR-CALNAME:WRC + GTWC Europe + F1 + UFC (Master Feed)",
-        "X-WR-TIMEZONE:America/New_York",
-        *events,
-        "END:VCALENDAR",
-        "",
-    ]
-    return "\n".join(cal_lines)
+    fp.write("END:VCALENDAR\r\n")
+    return ufc_ok
 
 
+_DTSTAMP_RE = re.compile(rb'DTSTAMP:\d{8}T\d{6}Z')
+
+@contextlib.contextmanager
+def _atomic_open(path: Path, mode: str, **kwargs: Any) -> Iterator[IO[Any]]:
+    """
+    Open a sibling <path>.tmp for writing and os.replace it over `path` only
+    if the block succeeds, so a failure never truncates the last good file.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def input_hash(espn_html: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(espn_html.encode("utf-8"))
+    # Static tables live in this file, so editing it invalidates the cache too
+    h.update(Path(__file__).read_bytes())
+    # The UFC recency filter and year rollover depend on today's date
+    h.update(datetime.now(_ET).date().isoformat().encode("ascii"))
+    return h.hexdigest()
+
 def main() -> None:
-    ics = build_calendar()
-    with open("master.ics", "w", encoding="utf-8") as f:
-        f.write(ics)
+    out_path = Path("master.ics")
+
+    espn_html: Optional[str] = None
+    espn_error: Optional[Exception] = None
+    try:
+        espn_html = _load_cached(ESPN_UFC_URL, "espn_ufc")
+    except Exception as e:
+        # Recorded as the UFC placeholder; the session has already retried
+        espn_error = e
+
+    digest = input_hash(espn_html) if espn_html is not None else None
+    if (
+        digest
+        and out_path.exists()
+        and ESPN_HASH_PATH.exists()
+        and ESPN_HASH_PATH.read_text(encoding="utf-8").strip() == digest
+    ):
+        # Same inputs as the last build: only DTSTAMP would differ
+        stamp = f"DTSTAMP:{dtstamp_utc()}".encode("ascii")
+        ics = _DTSTAMP_RE.sub(stamp, out_path.read_bytes())
+        with _atomic_open(out_path, "wb") as f:
+            f.write(ics)
+        print("Inputs unchanged; refreshed DTSTAMP in master.ics")
+        return
+
+    # Forget the last inputs before rebuilding, so a failed or fallback build
+    # is never mistaken for a cacheable one on the next run
+    ESPN_HASH_PATH.unlink(missing_ok=True)
+
+    # Stream straight to disk; no full calendar string is held in memory
+    with _atomic_open(out_path, "w", encoding="utf-8", newline="", buffering=64 * 1024) as f:
+        ufc_ok = build_calendar(f, espn_html, espn_error)
+    if digest and ufc_ok:
+        CACHE_DIR.mkdir(exist_ok=True)
+        ESPN_HASH_PATH.write_text(digest, encoding="utf-8")
     print("Wrote master.ics")
 
 if __name__ == "__main__":